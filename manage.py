@@ -12,6 +12,8 @@ Usage:
 
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -36,10 +38,23 @@ NETWORK_NAME = "hfm-network"
 PROJECT_ROOT = Path(__file__).parent
 
 
-def run_command(cmd: List[str], cwd: Optional[Path] = None, check: bool = True) -> subprocess.CompletedProcess:
-    """Execute shell command"""
+@lru_cache(maxsize=None)
+def compose_command() -> List[str]:
+    """Prefer the Docker Compose plugin, fall back to standalone docker-compose.
+
+    Detected on first use so that help and argument errors never need docker.
+    """
+    try:
+        result = subprocess.run(["docker", "compose", "version"], capture_output=True, text=True)
+    except FileNotFoundError:
+        return ["docker-compose"]
+    return ["docker", "compose"] if result.returncode == 0 else ["docker-compose"]
+
+
+def run_command_capture(cmd: List[str], cwd: Optional[Path] = None, check: bool = True) -> subprocess.CompletedProcess:
+    """Execute shell command with short output and capture it"""
     try:
-        return subprocess.run(cmd, cwd=cwd, check=check, capture_output=True, text=True)
+        return subprocess.run(cmd, cwd=cwd, check=check, capture_output=True, text=True, errors="replace")
     except subprocess.CalledProcessError as e:
         print(f"Error: {e.stderr}")
         if check:
@@ -47,17 +62,32 @@ def run_command(cmd: List[str], cwd: Optional[Path] = None, check: bool = True)
         return e
 
 
+def run_command_stream(cmd: List[str], cwd: Optional[Path] = None, check: bool = True, prefix: str = "") -> int:
+    """Execute shell command, writing its output line by line as it arrives"""
+    with subprocess.Popen(
+        cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1, text=True,
+        errors="replace"  # container output isn't guaranteed to be valid UTF-8
+    ) as proc:
+        for line in proc.stdout:
+            sys.stdout.write(f"{prefix}{line}")
+
+    if check and proc.returncode != 0:
+        print(f"{prefix}Error: '{' '.join(cmd)}' exited with status {proc.returncode}")
+        sys.exit(1)
+    return proc.returncode
+
+
 def ensure_network():
     """Create Docker network if it doesn't exist"""
     print(f"Ensuring network '{NETWORK_NAME}' exists...")
-    result = run_command(
+    result = run_command_capture(
         ["docker", "network", "inspect", NETWORK_NAME],
         check=False
     )
 
     if result.returncode != 0:
         print(f"Creating network '{NETWORK_NAME}'...")
-        run_command(["docker", "network", "create", NETWORK_NAME])
+        run_command_capture(["docker", "network", "create", NETWORK_NAME])
         print("Network created!")
     else:
         print("Network already exists.")
@@ -72,10 +102,11 @@ def start_service(service: str):
         sys.exit(1)
 
     print(f"\nStarting {service}...")
-    # Build with full output, then start
+    # Build with full output, then start; prefix lines since services start in parallel
     print(f"Building {service} with detailed output...")
-    subprocess.run(["docker", "compose", "--progress", "plain", "build"], cwd=service_path)
-    run_command(["docker-compose", "up", "-d"], cwd=service_path)
+    prefix = f"[{service}] "
+    run_command_stream([*compose_command(), "--progress", "plain", "build"], cwd=service_path, prefix=prefix)
+    run_command_stream([*compose_command(), "up", "-d"], cwd=service_path, prefix=prefix)
     print(f"{service} started!")
 
 
@@ -88,7 +119,7 @@ def stop_service(service: str):
         sys.exit(1)
 
     print(f"\nStopping {service}...")
-    run_command(["docker-compose", "down"], cwd=service_path)
+    run_command_capture([*compose_command(), "down"], cwd=service_path)
     print(f"{service} stopped!")
 
 
@@ -97,8 +128,8 @@ def start_all():
     ensure_network()
     print("\nStarting all services...\n")
 
-    for service in SERVICES:
-        start_service(service)
+    with ThreadPoolExecutor(max_workers=len(SERVICES)) as executor:
+        list(executor.map(start_service, SERVICES))
 
     print("\n" + "="*50)
     print("All services started!")
@@ -122,9 +153,8 @@ def stop_all():
     """Stop all services"""
     print("\nStopping all services...\n")
 
-    # Stop in reverse order
-    for service in reversed(SERVICES):
-        stop_service(service)
+    with ThreadPoolExecutor(max_workers=len(SERVICES)) as executor:
+        list(executor.map(stop_service, reversed(SERVICES)))
 
     print("\n" + "="*50)
     print("All services stopped!")
@@ -149,10 +179,16 @@ def show_status():
     print("\nService Status:")
     print("="*80)
 
-    result = run_command(["docker", "ps", "--format", "table {{.Names}}\t{{.Status}}\t{{.Ports}}"])
+    result = run_command_capture(["docker", "ps", "--format", "table {{.Names}}\t{{.Status}}\t{{.Ports}}"])
     print(result.stdout)
 
 
+def fetch_recent_logs(service: str) -> subprocess.CompletedProcess:
+    """Capture the last lines of a service's logs"""
+    service_path = PROJECT_ROOT / "services" / service
+    return run_command_capture([*compose_command(), "logs", "--tail=20"], cwd=service_path, check=False)
+
+
 def show_logs(service: Optional[str] = None, follow: bool = False):
     """Show logs for service(s)"""
     if service:
@@ -161,20 +197,23 @@ def show_logs(service: Optional[str] = None, follow: bool = False):
             print(f"Error: Service '{service}' not found")
             sys.exit(1)
 
-        cmd = ["docker-compose", "logs"]
+        cmd = [*compose_command(), "logs"]
         if follow:
             cmd.append("-f")
 
         print(f"\nShowing logs for {service}...\n")
-        subprocess.run(cmd, cwd=service_path)
+        run_command_stream(cmd, cwd=service_path, check=False)
     else:
         print("\nShowing logs for all services...\n")
-        for svc in SERVICES:
+        # Fetch in parallel, print in order so output stays readable
+        with ThreadPoolExecutor(max_workers=len(SERVICES)) as executor:
+            results = list(executor.map(fetch_recent_logs, SERVICES))
+
+        for svc, result in zip(SERVICES, results):
             print(f"\n{'='*80}")
             print(f"Logs for {svc}")
             print(f"{'='*80}\n")
-            service_path = PROJECT_ROOT / "services" / svc
-            run_command(["docker-compose", "logs", "--tail=20"], cwd=service_path, check=False)
+            print(result.stdout)
 
 
 def print_usage():
@@ -0,0 +1,404 @@
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, List, Optional
+import os
+import math
+import time
+import asyncio
+import httpx
+import orjson
+
+SERVICE_URLS = {
+    "transactions": os.getenv("TRANSACTION_SERVICE_URL", "http://localhost:8001"),
+    "accounts": os.getenv("USER_ACCOUNT_SERVICE_URL", "http://localhost:8002"),
+    "notifications": os.getenv("NOTIFICATION_SERVICE_URL", "http://localhost:8003"),
+    "budget": os.getenv("BUDGET_SERVICE_URL", "http://localhost:8004"),
+}
+
+# Admission control: at most MAX_ACTIVE_REQUESTS proxied at once, and
+# callers beyond MAX_TOTAL_REQUESTS (active + queued) are turned away.
+# Both limits are per worker process, so the gateway as a whole admits
+# WEB_CONCURRENCY times as many
+MAX_ACTIVE_REQUESTS = int(os.getenv("MAX_ACTIVE_REQUESTS", "200"))
+MAX_TOTAL_REQUESTS = int(os.getenv("MAX_TOTAL_REQUESTS", "1000"))
+
+# Time budget in seconds for a proxied request, overridable per call with the
+# x-request-deadline header; upstreams receive whatever budget is left
+DEADLINE_HEADER = b"x-request-deadline"
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "5.0"))
+MAX_REQUEST_DEADLINE = 30.0
+
+# Comma-separated origins the frontend is served from
+ALLOWED_ORIGINS = [origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "").split(",") if origin.strip()]
+
+PROXY_METHODS = ["GET", "POST", "PUT", "DELETE"]
+BODY_METHODS = frozenset({"POST", "PUT"})
+
+API_PREFIX = "/api/v1/"
+# First path segment under API_PREFIX -> upstream service
+RESOURCE_SERVICES = {
+    "transactions": "transactions",
+    "users": "accounts",
+    "accounts": "accounts",
+    "notifications": "notifications",
+    "preferences": "notifications",
+    "budgets": "budget",
+    "insights": "budget",
+}
+MAX_BATCH_SIZE = 100
+
+# Connection-scoped headers that must not be relayed; content-length is
+# recomputed for whichever body is actually sent. Kept as bytes so raw
+# header lists can be filtered without decoding them
+HOP_BY_HOP = frozenset({
+    b"connection", b"keep-alive", b"transfer-encoding", b"upgrade", b"proxy-authenticate",
+    b"proxy-authorization", b"proxy-connection", b"te", b"trailer", b"trailers", b"host",
+    b"content-length",
+})
+# The gateway's own server sets these on every response it sends
+NOT_RELAYED = HOP_BY_HOP | {b"date", b"server"}
+
+class Admission:
+    """Counts active and queued requests under one condition, so resize() can change the limits safely."""
+
+    def __init__(self, max_active: int, max_total: int):
+        self.cond = asyncio.Condition()
+        self.max_active = max_active
+        self.max_total = max_total
+        self.active = 0
+        self.queued = 0
+
+    @property
+    def total_requests(self) -> int:
+        return self.active + self.queued
+
+    async def acquire(self):
+        async with self.cond:
+            if self.total_requests >= self.max_total:
+                raise HTTPException(status_code=503, detail="Gateway overloaded, try again later")
+            self.queued += 1
+            try:
+                await self.cond.wait_for(lambda: self.active < self.max_active)
+            except BaseException:
+                # Hand on a wake-up this waiter may have consumed
+                self.cond.notify(1)
+                raise
+            finally:
+                self.queued -= 1
+            self.active += 1
+
+    async def release(self):
+        async with self.cond:
+            self.active -= 1
+            self.cond.notify(1)
+
+    async def resize(self, max_active: int, max_total: int):
+        async with self.cond:
+            self.max_active = max_active
+            self.max_total = max_total
+            # A higher limit may admit several waiters at once
+            self.cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.release()
+
+def create_client(url: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=url,
+        # Upstreams speak HTTP/1.1, so every in-flight request holds its own
+        # connection; size the pool so admission, not the pool, is the limit
+        limits=httpx.Limits(
+            max_keepalive_connections=50,
+            max_connections=MAX_ACTIVE_REQUESTS,
+            keepalive_expiry=30.0
+        ),
+        timeout=httpx.Timeout(5.0, connect=2.0)
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client per upstream so a slow service can't starve the others
+    app.state.clients = {name: create_client(url) for name, url in SERVICE_URLS.items()}
+    app.state.admission = Admission(MAX_ACTIVE_REQUESTS, MAX_TOTAL_REQUESTS)
+    yield
+    for client in app.state.clients.values():
+        await client.aclose()
+
+app = FastAPI(
+    title="HFM API Gateway",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=ALLOWED_ORIGINS,
+    allow_credentials=True,
+    allow_methods=PROXY_METHODS,
+    allow_headers=["authorization", "content-type", DEADLINE_HEADER.decode()],
+)
+
+class BatchItem(BaseModel):
+    method: str
+    path: str
+    body: Optional[Any] = None
+
+def relay_headers(relayed: Response, upstream: httpx.Response) -> Response:
+    # httpx keeps the upstream's casing in raw; ASGI wants lowercase names
+    relayed.raw_headers.extend(
+        (key.lower(), value)
+        for key, value in upstream.headers.raw
+        if key.lower() not in NOT_RELAYED
+    )
+    return relayed
+
+async def forward(
+    app: FastAPI,
+    service_name: str,
+    method: str,
+    path: str,
+    headers: list,
+    deadline: float,
+    content=None,
+    stream_events: bool = True
+) -> Response:
+    client = app.state.clients[service_name]
+
+    # The deadline covers the whole exchange: waiting for a slot, the send
+    # and draining the body, not just each individual socket read
+    try:
+        async with asyncio.timeout(deadline - time.monotonic()):
+            # Event streams release their slot once headers arrive, not when the stream ends
+            async with app.state.admission:
+                # Time spent queued for a slot counts against the budget
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise HTTPException(status_code=504, detail=f"Deadline exceeded before calling '{service_name}'")
+
+                upstream_request = client.build_request(
+                    method,
+                    path,
+                    headers=headers + [(DEADLINE_HEADER, f"{remaining:.3f}".encode())],
+                    content=content,
+                    # httpx applies the read timeout to every later read of the body,
+                    # including an event stream relayed after this block returns, so
+                    # leave reads unbounded there; the enclosing asyncio.timeout still
+                    # bounds everything up to the response headers
+                    timeout=httpx.Timeout(
+                        connect=0.5,
+                        read=None if stream_events else max(0.1, remaining),
+                        write=1.0,
+                        pool=0.5
+                    )
+                )
+                response = await client.send(upstream_request, stream=True)
+
+                content_type = response.headers.get("content-type")
+                # Event streams stay open, so relay them as they arrive
+                if stream_events and content_type and content_type.startswith("text/event-stream"):
+                    return relay_headers(StreamingResponse(
+                        response.aiter_raw(),
+                        status_code=response.status_code,
+                        background=BackgroundTask(response.aclose)
+                    ), response)
+
+                # Everything else is forwarded as-is, without decoding and re-encoding
+                try:
+                    content = b"".join([chunk async for chunk in response.aiter_raw()])
+                except BaseException:
+                    await response.aclose()
+                    raise
+    except (TimeoutError, httpx.TimeoutException):
+        raise HTTPException(status_code=504, detail=f"Service '{service_name}' timed out")
+    except httpx.RequestError:
+        raise HTTPException(status_code=503, detail=f"Service '{service_name}' unavailable")
+
+    return relay_headers(Response(content=content, status_code=response.status_code), response)
+
+def forward_headers(request: Request) -> list:
+    # The deadline header is re-added by forward() with the remaining budget
+    return [
+        (key, value) for key, value in request.headers.raw
+        if key not in HOP_BY_HOP and key != DEADLINE_HEADER
+    ]
+
+def request_deadline(request: Request) -> float:
+    header = request.headers.get("x-request-deadline")
+    if header is None:
+        budget = REQUEST_DEADLINE
+    else:
+        try:
+            budget = float(header)
+        except ValueError:
+            budget = math.nan
+        if math.isnan(budget):
+            raise HTTPException(status_code=400, detail="x-request-deadline must be a number of seconds")
+    # An exhausted (zero or negative) budget fails with 504 before any upstream call
+    return time.monotonic() + min(max(budget, 0.0), MAX_REQUEST_DEADLINE)
+
+async def proxy_request(service_name: str, path: str, method: str, request: Request, stream_events: bool = True):
+    # Pass the query string through as sent; rebuilding it from
+    # query_params would keep only the last value of a repeated key
+    query = request.url.query
+    # Stream the incoming body straight through instead of buffering it
+    return await forward(
+        request.app,
+        service_name,
+        method,
+        f"{path}?{query}" if query else path,
+        forward_headers(request),
+        request_deadline(request),
+        content=request.stream() if method in BODY_METHODS else None,
+        stream_events=stream_events
+    )
+
+async def forward_auth(method: str, path: str, request: Request):
+    # Auth replies are small JSON documents, never event streams
+    return await proxy_request("accounts", path, method, request, stream_events=False)
+
+# Frontends batch the same handful of paths over and over
+@lru_cache(maxsize=1024)
+def resolve_service(path: str):
+    """Map a gateway path such as /api/v1/budgets/1 to its service and upstream path."""
+    if not path.startswith(API_PREFIX):
+        raise HTTPException(status_code=404, detail=f"Unknown path '{path}'")
+    upstream_path = path[len(API_PREFIX) - 1:]
+    resource = upstream_path[1:].split("/", 1)[0].split("?", 1)[0]
+    if resource not in RESOURCE_SERVICES:
+        raise HTTPException(status_code=404, detail=f"Unknown path '{path}'")
+    return RESOURCE_SERVICES[resource], upstream_path
+
+def decode_body(response: Response):
+    if not response.body:
+        return None
+    try:
+        return orjson.loads(response.body)
+    except orjson.JSONDecodeError:
+        return response.body.decode("utf-8", errors="replace")
+
+async def run_batch_item(app: FastAPI, item: BatchItem, headers: list, deadline: float):
+    method = item.method.upper()
+    if method not in PROXY_METHODS:
+        raise HTTPException(status_code=405, detail=f"Method '{item.method}' not allowed")
+    service_name, path = resolve_service(item.path)
+
+    content = None
+    if item.body is not None:
+        content = orjson.dumps(item.body)
+        headers = headers + [(b"content-type", b"application/json")]
+    response = await forward(app, service_name, method, path, headers, deadline, content=content, stream_events=False)
+    return {"status": response.status_code, "body": decode_body(response)}
+
+# Both are polled constantly and never change, so serialize them once
+ROOT_BYTES = orjson.dumps({"service": "HFM API Gateway", "status": "running", "services": SERVICE_URLS})
+HEALTH_BYTES = orjson.dumps({"status": "healthy", "gateway": "operational"})
+
+@app.get("/")
+async def read_root():
+    return Response(content=ROOT_BYTES, media_type="application/json")
+
+@app.get("/health")
+async def health_check():
+    return Response(content=HEALTH_BYTES, media_type="application/json")
+
+# Authentication
+@app.post("/api/v1/auth/register")
+async def register(request: Request):
+    return await forward_auth("POST", "/users/register", request)
+
+@app.post("/api/v1/auth/login")
+async def login(request: Request):
+    return await forward_auth("POST", "/users/login", request)
+
+@app.get("/api/v1/auth/me")
+async def me(request: Request):
+    return await forward_auth("GET", "/users/me", request)
+
+# Batch: several sub-requests in one round-trip, run concurrently
+@app.post("/api/v1/batch")
+async def batch(items: List[BatchItem], request: Request):
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"A batch may contain at most {MAX_BATCH_SIZE} requests")
+
+    # Sub-requests carry the caller's headers (e.g. authorization) but not its body framing
+    headers = [(key, value) for key, value in forward_headers(request) if key != b"content-type"]
+    # Sub-requests run in parallel, so they all share the batch's deadline
+    deadline = request_deadline(request)
+    results = await asyncio.gather(
+        *[run_batch_item(request.app, item, headers, deadline) for item in items],
+        return_exceptions=True
+    )
+
+    # One failed sub-request doesn't fail the batch
+    responses = []
+    for result in results:
+        if isinstance(result, HTTPException):
+            responses.append({"status": result.status_code, "error": result.detail})
+        elif isinstance(result, Exception):
+            responses.append({"status": 502, "error": "Sub-request failed"})
+        else:
+            responses.append(result)
+    return responses
+
+# Service proxies
+@app.api_route("/api/v1/transactions", methods=PROXY_METHODS)
+@app.api_route("/api/v1/transactions/{path:path}", methods=PROXY_METHODS)
+async def transactions_proxy(request: Request, path: str = ""):
+    full_path = f"/transactions/{path}" if path else "/transactions"
+    return await proxy_request("transactions", full_path, request.method, request)
+
+@app.api_route("/api/v1/users/{path:path}", methods=PROXY_METHODS)
+async def users_proxy(request: Request, path: str = ""):
+    full_path = f"/users/{path}" if path else "/users"
+    return await proxy_request("accounts", full_path, request.method, request)
+
+@app.api_route("/api/v1/accounts", methods=PROXY_METHODS)
+@app.api_route("/api/v1/accounts/{path:path}", methods=PROXY_METHODS)
+async def accounts_proxy(request: Request, path: str = ""):
+    full_path = f"/accounts/{path}" if path else "/accounts"
+    return await proxy_request("accounts", full_path, request.method, request)
+
+@app.api_route("/api/v1/notifications", methods=PROXY_METHODS)
+@app.api_route("/api/v1/notifications/{path:path}", methods=PROXY_METHODS)
+async def notifications_proxy(request: Request, path: str = ""):
+    full_path = f"/notifications/{path}" if path else "/notifications"
+    return await proxy_request("notifications", full_path, request.method, request)
+
+@app.api_route("/api/v1/preferences/{path:path}", methods=PROXY_METHODS)
+async def preferences_proxy(request: Request, path: str = ""):
+    full_path = f"/preferences/{path}" if path else "/preferences"
+    return await proxy_request("notifications", full_path, request.method, request)
+
+@app.api_route("/api/v1/budgets", methods=PROXY_METHODS)
+@app.api_route("/api/v1/budgets/{path:path}", methods=PROXY_METHODS)
+async def budget_proxy(request: Request, path: str = ""):
+    full_path = f"/budgets/{path}" if path else "/budgets"
+    return await proxy_request("budget", full_path, request.method, request)
+
+@app.api_route("/api/v1/insights/{path:path}", methods=PROXY_METHODS)
+async def insights_proxy(request: Request, path: str = ""):
+    full_path = f"/insights/{path}" if path else "/insights"
+    return await proxy_request("budget", full_path, request.method, request)
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "4")),
+        log_level="info",
+        access_log=False
+    )
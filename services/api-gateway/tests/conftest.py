@@ -0,0 +1,74 @@
+import asyncio
+import inspect
+import os
+import socket
+import threading
+import time
+
+import httpx
+import pytest
+import uvicorn
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+os.environ.setdefault("ALLOWED_ORIGINS", "http://frontend.test")
+
+import main  # noqa: E402
+
+
+@pytest.fixture
+def gateway():
+    with TestClient(main.app) as client:
+        yield client
+
+
+async def as_stream(body: bytes):
+    yield body
+
+
+@pytest.fixture
+def upstream():
+    """Route a service's traffic to a handler instead of the network."""
+    def install(service_name, handler):
+        async def transport_handler(request):
+            response = handler(request)
+            if inspect.isawaitable(response):
+                response = await response
+            # Responses built from bytes arrive already read, which a real
+            # transport never does and aiter_raw() refuses
+            if response.is_stream_consumed:
+                response = httpx.Response(
+                    response.status_code, headers=response.headers, content=as_stream(response.content)
+                )
+            return response
+
+        main.app.state.clients[service_name] = httpx.AsyncClient(
+            base_url=main.SERVICE_URLS[service_name], transport=httpx.MockTransport(transport_handler)
+        )
+    return install
+
+
+@pytest.fixture
+def event_stream_upstream():
+    """Serve an event stream that goes quiet for longer than a short deadline."""
+    async def events():
+        yield b"data: 1\n\n"
+        await asyncio.sleep(0.6)
+        yield b"data: 2\n\n"
+
+    async def stream(request):
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    app = Starlette(routes=[Route("/notifications/{user_id}/stream", stream)])
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    server.should_exit = True
+    thread.join()
@@ -0,0 +1,185 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import main
+
+
+def test_slow_upstream_times_out_at_deadline(gateway, upstream):
+    async def trickle():
+        for _ in range(10):
+            await asyncio.sleep(0.2)
+            yield b"x"
+
+    async def handler(request):
+        return httpx.Response(200, content=trickle())
+
+    upstream("transactions", handler)
+    started = time.monotonic()
+    response = gateway.get("/api/v1/transactions/1", headers={"x-request-deadline": "0.5"})
+
+    assert response.status_code == 504
+    assert time.monotonic() - started < 1.5
+
+
+def test_remaining_budget_is_passed_upstream(gateway, upstream):
+    seen = {}
+
+    def handler(request):
+        seen["deadline"] = float(request.headers["x-request-deadline"])
+        return httpx.Response(200, json=[])
+
+    upstream("transactions", handler)
+    response = gateway.get("/api/v1/transactions/1", headers={"x-request-deadline": "2"})
+
+    assert response.status_code == 200
+    assert 0 < seen["deadline"] <= 2
+
+
+def test_malformed_deadline_is_rejected(gateway, upstream):
+    upstream("transactions", lambda request: httpx.Response(200, json=[]))
+
+    response = gateway.get("/api/v1/transactions/1", headers={"x-request-deadline": "abc"})
+
+    assert response.status_code == 400
+
+
+def test_exhausted_deadline_fails_without_calling_upstream(gateway, upstream):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=[])
+
+    upstream("transactions", handler)
+    response = gateway.get("/api/v1/transactions/1", headers={"x-request-deadline": "0"})
+
+    assert response.status_code == 504
+    assert calls == []
+
+
+def test_preflight_allows_deadline_header(gateway):
+    response = gateway.options("/api/v1/transactions/1", headers={
+        "origin": "http://frontend.test",
+        "access-control-request-method": "GET",
+        "access-control-request-headers": "authorization, x-request-deadline",
+    })
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://frontend.test"
+
+
+def test_relayed_headers_skip_connection_and_server_headers(gateway, upstream):
+    upstream("budget", lambda request: httpx.Response(200, json=[], headers={
+        "Date": "Mon, 01 Jan 2024 00:00:00 GMT",
+        "Server": "uvicorn",
+        "Connection": "keep-alive",
+        "X-Upstream": "budget",
+    }))
+
+    response = gateway.get("/api/v1/budgets/1")
+
+    assert response.status_code == 200
+    assert response.headers["x-upstream"] == "budget"
+    assert response.headers["content-type"] == "application/json"
+    assert "date" not in response.headers
+    assert "server" not in response.headers
+    assert "connection" not in response.headers
+
+
+def test_gateway_routes_are_registered():
+    assert len(main.app.router.routes) > 5
+
+
+def test_admission_rejects_at_total_limit():
+    async def scenario():
+        admission = main.Admission(max_active=1, max_total=2)
+        await admission.acquire()
+        waiter = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        assert (admission.active, admission.queued) == (1, 1)
+
+        with pytest.raises(HTTPException) as rejected:
+            await admission.acquire()
+        assert rejected.value.status_code == 503
+
+        await admission.release()
+        await waiter
+        assert (admission.active, admission.queued) == (1, 0)
+
+    asyncio.run(scenario())
+
+
+def test_admission_resize_admits_waiters():
+    async def scenario():
+        admission = main.Admission(max_active=1, max_total=10)
+        await admission.acquire()
+        waiters = [asyncio.create_task(admission.acquire()) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert admission.queued == 2
+
+        await admission.resize(max_active=3, max_total=10)
+        await asyncio.gather(*waiters)
+        assert (admission.active, admission.queued) == (3, 0)
+
+    asyncio.run(scenario())
+
+
+def test_resolve_service():
+    assert main.resolve_service("/api/v1/budgets/1/analysis") == ("budget", "/budgets/1/analysis")
+    assert main.resolve_service("/api/v1/users/me?x=1") == ("accounts", "/users/me?x=1")
+    with pytest.raises(HTTPException):
+        main.resolve_service("/api/v1/unknown")
+
+
+def test_batch_reports_each_item(gateway, upstream):
+    def unreachable(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    upstream("transactions", lambda request: httpx.Response(200, json=[{"id": 1}]))
+    upstream("notifications", unreachable)
+
+    response = gateway.post("/api/v1/batch", json=[
+        {"method": "GET", "path": "/api/v1/transactions/1"},
+        {"method": "GET", "path": "/api/v1/nowhere"},
+        {"method": "PATCH", "path": "/api/v1/transactions/1"},
+        {"method": "GET", "path": "/api/v1/notifications/1"},
+    ])
+
+    assert response.status_code == 200
+    assert [item["status"] for item in response.json()] == [200, 404, 405, 503]
+    assert response.json()[0]["body"] == [{"id": 1}]
+    assert "error" in response.json()[3]
+
+
+def test_batch_size_is_capped(gateway):
+    items = [{"method": "GET", "path": "/api/v1/transactions/1"}] * (main.MAX_BATCH_SIZE + 1)
+
+    assert gateway.post("/api/v1/batch", json=items).status_code == 400
+
+
+def test_repeated_query_keys_are_forwarded(gateway, upstream):
+    seen = {}
+
+    def handler(request):
+        seen["query"] = request.url.query
+        return httpx.Response(200, json=[])
+
+    upstream("transactions", handler)
+    response = gateway.get("/api/v1/transactions/1?tag=a&tag=b&q=a%20b%2Bc")
+
+    assert response.status_code == 200
+    assert seen["query"] == b"tag=a&tag=b&q=a%20b%2Bc"
+
+
+def test_event_stream_outlives_request_deadline(gateway, event_stream_upstream):
+    # Real sockets here: MockTransport doesn't apply httpx's read timeouts
+    main.app.state.clients["notifications"] = main.create_client(event_stream_upstream)
+
+    response = gateway.get("/api/v1/notifications/1/stream", headers={"x-request-deadline": "0.3"})
+
+    assert response.status_code == 200
+    assert response.text == "data: 1\n\ndata: 2\n\n"
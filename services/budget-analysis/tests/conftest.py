@@ -0,0 +1,11 @@
+import pytest
+
+import main
+
+
+@pytest.fixture(scope="session", autouse=True)
+def numba_runtime():
+    # TestClient runs the lifespan on a worker thread; Numba's parallel
+    # runtime hangs the interpreter at exit unless it first starts up on the
+    # main thread, as it does under uvicorn
+    main.warm_up_compute_spent()
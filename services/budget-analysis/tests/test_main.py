@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import main
+
+
+def transaction_client(transactions, requests=None):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if requests is not None:
+            requests.append(request)
+        return httpx.Response(200, json=transactions)
+
+    return httpx.AsyncClient(base_url="http://transactions", transport=httpx.MockTransport(handler))
+
+
+def test_spending_insights_groups_missing_category():
+    client = transaction_client([
+        {"amount": 10.0, "category": "food", "transaction_date": "2026-01-02T00:00:00"},
+        {"amount": 5.0, "category": None, "transaction_date": "2026-01-03T00:00:00"},
+        {"amount": 2.5, "category": "food", "transaction_date": "2026-01-04T00:00:00"},
+    ])
+
+    insights = asyncio.run(main._compute_spending_insights(client, 1, 30))
+
+    assert [(i.category, i.total_spent, i.transaction_count) for i in insights] == [
+        ("food", 12.5, 2),
+        ("", 5.0, 1),
+    ]
+
+
+def test_budget_analysis_handles_null_category():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    main.Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    with SessionLocal() as db:
+        db.add(main.Budget(
+            user_id=1,
+            name="Groceries",
+            category="Food",
+            amount=100.0,
+            period="monthly",
+            start_date=datetime(2026, 1, 1),
+            end_date=datetime(2026, 1, 31)
+        ))
+        db.commit()
+
+    def get_test_db():
+        with SessionLocal() as db:
+            yield db
+
+    requests = []
+    main.app.dependency_overrides[main.get_db] = get_test_db
+    try:
+        with TestClient(main.app) as client:
+            main.app.state.http = transaction_client([
+                {"amount": 30.0, "category": "food", "transaction_date": "2026-01-05T00:00:00"},
+                {"amount": 7.0, "category": None, "transaction_date": "2026-01-06T00:00:00"},
+                {"amount": 50.0, "category": "FOOD", "transaction_date": "2026-02-05T00:00:00"},
+            ], requests)
+            response = client.get("/budgets/1/analysis")
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    [analysis] = response.json()
+    assert analysis["spent_amount"] == 30.0
+    assert analysis["status"] == "on_track"
+    # A lone budget category is filtered by the transaction service
+    [fetch] = requests
+    assert fetch.url.params["category"] == "food"
+
+
+def test_spending_insights_without_redis():
+    # Nothing listens on REDIS_URL here, so both cache calls fail and are skipped
+    with TestClient(main.app) as client:
+        main.app.state.http = transaction_client([
+            {"amount": 4.0, "category": "fuel", "transaction_date": "2026-01-02T00:00:00"},
+        ])
+        response = client.get("/insights/1/spending")
+
+    assert response.status_code == 200
+    assert response.json()[0]["total_spent"] == 4.0